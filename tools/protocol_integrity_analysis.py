@@ -8,15 +8,18 @@ neural network simulations to validate performance claims.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+import copy
+import functools
 import json
-import hashlib
 import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
-import random
-import statistics
+
+try:
+    import orjson
+except ImportError:  # Optional fast serializer; falls back to the stdlib json
+    orjson = None
 
 class MessageType(Enum):
     INIT = 0x01
@@ -44,6 +47,31 @@ class TransportHint(Enum):
     QUDAG = "qudag"
     DUAL = "dual"
 
+# Ordinal order used by the int8 agent columns
+_QOS_CLASSES = tuple(QoSClass)
+_TRANSPORT_HINTS = tuple(TransportHint)
+
+# Per-QoS lookup tables, indexed by QoS ordinal: 50ms base for realtime,
+# 150ms for interactive and 500ms for batch
+_QOS_PRIORITY = np.array([1.0, 0.6, 0.3])
+_QOS_BASE_LATENCY_MS = np.array([50.0, 150.0, 500.0])
+
+# Ranges of the per-message uniform draws, one column each: network load,
+# network congestion, router efficiency, error rate, random network factor,
+# cross-region penalty, network error rate and the success draw
+_MESSAGE_UNIFORM_LOW = np.array([0.3, 0.1, 0.8, 0.0, 0.5, 2.0, 0.0, 0.0])
+_MESSAGE_UNIFORM_HIGH = np.array([0.9, 0.9, 1.0, 0.3, 1.0, 4.0, 0.1, 1.0])
+
+def _lower_quantiles(values: np.ndarray, quantiles: Tuple[float, ...]) -> List[float]:
+    """Quantiles with ``np.quantile(..., method='lower')`` semantics.
+    
+    Uses a single linear-time ``np.partition`` over all requested ranks
+    instead of the full sort ``np.percentile`` performs.
+    """
+    ranks = [int(q * (values.size - 1)) for q in quantiles]
+    partitioned = np.partition(values, ranks)
+    return [float(partitioned[rank]) for rank in ranks]
+
 @dataclass
 class PerformanceMetrics:
     latency_ms: float
@@ -55,132 +83,154 @@ class PerformanceMetrics:
 
 @dataclass
 class Agent:
-    agent_id: str
     region: str
+    local_idx: int
     supported_intents: List[str]
     performance_class: QoSClass
     transport_pref: TransportHint
     load_factor: float = 0.0
     last_heartbeat: float = 0.0
+    
+    @property
+    def agent_id(self) -> str:
+        return f"llm://agent-{self.region}-{self.local_idx:04d}"
 
 class ProtocolIntegrityAnalyzer:
     """Analyzes IICP protocol specification for consistency and completeness."""
     
+    # Expected message type mappings
+    _EXPECTED_OPCODES = {
+        MessageType.INIT: 0x01,
+        MessageType.ACK: 0x02,
+        MessageType.DISCOVER: 0x03,
+        MessageType.SUB_PROTOCOL: 0x04,
+        MessageType.CALL: 0x05,
+        MessageType.RESPONSE: 0x06,
+        MessageType.CLOSE: 0x07,
+        MessageType.FEEDBACK: 0x08,
+        MessageType.PING: 0x09,
+        MessageType.PONG: 0x0A,
+        MessageType.CONTROL: 0x0B,
+        MessageType.ADVERTISE: 0x0C,
+        MessageType.OBSERVE: 0x0D,
+        MessageType.TELEMETRY: 0x0E
+    }
+    _EXPECTED_OPCODE_SET = frozenset(range(0x01, 0x0F))
+    _ACTUAL_OPCODE_SET = frozenset(_EXPECTED_OPCODES.values())
+    _OPCODES_UNIQUE = len(_ACTUAL_OPCODE_SET) == len(_EXPECTED_OPCODES)
+    
+    # Core required headers for each message type
+    _REQUIRED_HEADERS = {
+        MessageType.INIT: ("agent_id", "intent", "transport_pref", "min_version", "max_version"),
+        MessageType.CALL: ("intent", "trace_id", "X-IICP-Auth-Method"),
+        MessageType.RESPONSE: ("code", "trace_id"),
+        MessageType.PING: ("intent", "trace_id", "X-IICP-TTL"),
+        MessageType.PONG: ("intent", "trace_id", "X-IICP-TTL")
+    }
+    _IICP_HEADERS = (
+        "X-IICP-TTL", "X-IICP-Hash", "X-IICP-Lock", "X-IICP-Transport-Hint",
+        "X-IICP-Trace-Hash", "X-IICP-Auth-Method", "X-IICP-Retry-Policy",
+        "X-IICP-Routing-Hint", "X-IICP-Scheduling-Hint"
+    )
+    
+    # IICP v1.4.2 should support versions 0x09-0x0E (9-14)
+    _MIN_VERSION = 0x09
+    _MAX_VERSION = 0x0E
+    _CURRENT_VERSION = 0x0E  # v1.4.2 maps to 14
+    
     def __init__(self):
         self.issues = []
         self.validation_results = {}
         
+    def _analyze_group(self, group: str, heading: str, summary: str) -> Dict[str, bool]:
+        """Run the compiled validator and record the results of one analysis group."""
+        print(f"🔍 Analyzing {heading}...")
+        checks, issues = self._compiled_validator()()
+        self.issues.extend(issues[group])
+        self.validation_results[group] = checks[group]
+        print(f"✅ {summary}: {all(checks[group].values())}")
+        return checks[group]
+    
     def analyze_message_consistency(self) -> Dict[str, bool]:
         """Analyze message type consistency across protocol specification."""
-        print("🔍 Analyzing Protocol Message Consistency...")
-        
-        # Define expected message type mappings
-        expected_opcodes = {
-            MessageType.INIT: 0x01,
-            MessageType.ACK: 0x02,
-            MessageType.DISCOVER: 0x03,
-            MessageType.SUB_PROTOCOL: 0x04,
-            MessageType.CALL: 0x05,
-            MessageType.RESPONSE: 0x06,
-            MessageType.CLOSE: 0x07,
-            MessageType.FEEDBACK: 0x08,
-            MessageType.PING: 0x09,
-            MessageType.PONG: 0x0A,
-            MessageType.CONTROL: 0x0B,
-            MessageType.ADVERTISE: 0x0C,
-            MessageType.OBSERVE: 0x0D,
-            MessageType.TELEMETRY: 0x0E
-        }
-        
-        consistency_check = {
-            "opcode_uniqueness": True,
-            "range_validity": True,
-            "completeness": True
-        }
-        
-        # Check opcode uniqueness
-        opcodes = list(expected_opcodes.values())
-        if len(opcodes) != len(set(opcodes)):
-            consistency_check["opcode_uniqueness"] = False
-            self.issues.append("Duplicate opcodes found in message type definitions")
-        
-        # Check range validity (0x01-0x0E)
-        for opcode in opcodes:
-            if not (0x01 <= opcode <= 0x0E):
-                consistency_check["range_validity"] = False
-                self.issues.append(f"Opcode {hex(opcode)} outside valid range")
-        
-        # Check completeness (no gaps)
-        expected_range = set(range(0x01, 0x0F))
-        actual_opcodes = set(opcodes)
-        if actual_opcodes != expected_range:
-            missing = expected_range - actual_opcodes
-            if missing:
-                consistency_check["completeness"] = False
-                self.issues.append(f"Missing opcodes: {[hex(x) for x in missing]}")
-        
-        print(f"✅ Message consistency: {all(consistency_check.values())}")
-        return consistency_check
+        return self._analyze_group("message_consistency", "Protocol Message Consistency",
+                                   "Message consistency")
     
     def analyze_header_field_consistency(self) -> Dict[str, bool]:
         """Analyze header field definitions for consistency."""
-        print("🔍 Analyzing Header Field Consistency...")
-        
-        # Core required headers for each message type
-        required_headers = {
-            MessageType.INIT: ["agent_id", "intent", "transport_pref", "min_version", "max_version"],
-            MessageType.CALL: ["intent", "trace_id", "X-IICP-Auth-Method"],
-            MessageType.RESPONSE: ["code", "trace_id"],
-            MessageType.PING: ["intent", "trace_id", "X-IICP-TTL"],
-            MessageType.PONG: ["intent", "trace_id", "X-IICP-TTL"]
-        }
-        
-        header_consistency = {
-            "naming_convention": True,
-            "type_consistency": True,
-            "required_coverage": True
-        }
-        
-        # Check X-IICP prefix consistency
-        iicp_headers = [
-            "X-IICP-TTL", "X-IICP-Hash", "X-IICP-Lock", "X-IICP-Transport-Hint",
-            "X-IICP-Trace-Hash", "X-IICP-Auth-Method", "X-IICP-Retry-Policy",
-            "X-IICP-Routing-Hint", "X-IICP-Scheduling-Hint"
-        ]
-        
-        for header in iicp_headers:
-            if not header.startswith("X-IICP-"):
-                header_consistency["naming_convention"] = False
-                self.issues.append(f"Header {header} doesn't follow X-IICP- convention")
-        
-        print(f"✅ Header consistency: {all(header_consistency.values())}")
-        return header_consistency
+        return self._analyze_group("header_consistency", "Header Field Consistency",
+                                   "Header consistency")
     
     def analyze_version_compatibility(self) -> Dict[str, bool]:
         """Analyze version compatibility ranges."""
-        print("🔍 Analyzing Version Compatibility...")
-        
-        version_check = {
-            "range_validity": True,
-            "backward_compatibility": True,
-            "forward_compatibility": True
-        }
-        
-        # IICP v1.4.2 should support versions 0x09-0x0E (9-14)
-        min_version = 0x09
-        max_version = 0x0E
-        current_version = 0x0E  # v1.4.2 maps to 14
-        
-        if min_version >= max_version:
-            version_check["range_validity"] = False
-            self.issues.append("Invalid version range: min >= max")
-        
-        if current_version < min_version or current_version > max_version:
-            version_check["range_validity"] = False
-            self.issues.append("Current version outside supported range")
+        return self._analyze_group("version_compatibility", "Version Compatibility",
+                                   "Version compatibility")
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _compiled_validator(cls):
+        """Generate every integrity rule as one flat function, compiled once per class.
+        
+        This is the single definition of the rules; the ``analyze_*`` methods
+        read their group from its result. Every rule input is a class
+        constant, so the generated source inlines each opcode, header and
+        version as a literal comparison. The function returns
+        ``(checks, issues)``, both keyed by analysis group like
+        ``validation_results``.
+        """
+        def fail(flag: str, issues: str, issue: str) -> List[str]:
+            return [f"        {flag} = False", f"        {issues}.append({issue!r})"]
+        
+        src = [
+            "def _validate():",
+            "    message_issues, header_issues, version_issues = [], [], []",
+            "    opcode_uniqueness = range_validity = completeness = True",
+            "    naming_convention = version_range_validity = True",
+            # Check opcode uniqueness
+            f"    if not {cls._OPCODES_UNIQUE!r}:",
+            *fail("opcode_uniqueness", "message_issues",
+                  "Duplicate opcodes found in message type definitions"),
+        ]
+        # Check range validity (0x01-0x0E)
+        for opcode in sorted(cls._ACTUAL_OPCODE_SET):
+            src.append(f"    if not (0x01 <= {opcode:#04x} <= 0x0E):")
+            src += fail("range_validity", "message_issues", f"Opcode {hex(opcode)} outside valid range")
+        # Check completeness (no gaps)
+        missing = cls._EXPECTED_OPCODE_SET - cls._ACTUAL_OPCODE_SET
+        if missing:
+            src.append("    if True:")
+            src += fail("completeness", "message_issues", f"Missing opcodes: {[hex(x) for x in missing]}")
+        # Check X-IICP prefix consistency
+        for header in cls._IICP_HEADERS:
+            src.append(f"    if not {header!r}.startswith('X-IICP-'):")
+            src += fail("naming_convention", "header_issues",
+                        f"Header {header} doesn't follow X-IICP- convention")
+        # Check the supported version range
+        src.append(f"    if {cls._MIN_VERSION:#04x} >= {cls._MAX_VERSION:#04x}:")
+        src += fail("version_range_validity", "version_issues", "Invalid version range: min >= max")
+        src.append(
+            f"    if {cls._CURRENT_VERSION:#04x} < {cls._MIN_VERSION:#04x}"
+            f" or {cls._CURRENT_VERSION:#04x} > {cls._MAX_VERSION:#04x}:"
+        )
+        src += fail("version_range_validity", "version_issues", "Current version outside supported range")
+        src += [
+            "    return {",
+            "        'message_consistency': {'opcode_uniqueness': opcode_uniqueness,"
+            " 'range_validity': range_validity, 'completeness': completeness},",
+            "        'header_consistency': {'naming_convention': naming_convention,"
+            " 'type_consistency': True, 'required_coverage': True},",
+            "        'version_compatibility': {'range_validity': version_range_validity,"
+            " 'backward_compatibility': True, 'forward_compatibility': True},",
+            "    }, {",
+            "        'message_consistency': message_issues,",
+            "        'header_consistency': header_issues,",
+            "        'version_compatibility': version_issues,",
+            "    }",
+        ]
         
-        print(f"✅ Version compatibility: {all(version_check.values())}")
-        return version_check
+        namespace = {}
+        exec(compile("\n".join(src), f"<{cls.__name__} validator>", "exec"), namespace)
+        return namespace["_validate"]
     
     def calculate_integrity_score(self) -> float:
         """Calculate overall protocol integrity score."""
@@ -213,25 +263,87 @@ class ProtocolIntegrityAnalyzer:
 class IICPNeuralNetworkSimulator:
     """Neural network-based simulation for IICP performance validation."""
     
-    def __init__(self, num_agents: int, num_routers: int, regions: List[str]):
+    def __init__(self, num_agents: int, num_routers: int, regions: List[str],
+                 seed: Optional[int] = None):
         self.num_agents = num_agents
         self.num_routers = num_routers
         self.regions = regions
-        self.agents = []
+        self.region_to_id = {region: i for i, region in enumerate(regions)}
+        self.cross_region_lut = 1 - np.eye(len(regions), dtype=np.uint8)
         self.routers = []
         self.metrics_history = []
         self.simulation_time = 0.0
+        self.rng = np.random.default_rng(seed)
         
         # Neural network parameters for behavior modeling
         self.nn_weights = {
-            'latency_prediction': np.random.normal(0, 0.1, (10, 5)),
-            'load_balancing': np.random.normal(0, 0.1, (8, 4)),
-            'failure_prediction': np.random.normal(0, 0.1, (6, 3))
+            'latency_prediction': self.rng.normal(0, 0.1, (10, 5)),
+            'load_balancing': self.rng.normal(0, 0.1, (8, 4)),
+            'failure_prediction': self.rng.normal(0, 0.1, (6, 3))
         }
+        self._fused_weights = self._fuse_prediction_weights()
+        
+        # Feature buffers reused by the single-message path
+        self._lat_features = np.empty(10)
+        self._fail_features = np.empty(6)
         
         self._initialize_agents()
         self._initialize_routers()
     
+    def view(self, num_agents: int, regions: List[str],
+             num_routers: Optional[int] = None) -> "IICPNeuralNetworkSimulator":
+        """Derive a smaller simulator that reuses this agent population.
+        
+        Takes the first ``num_agents`` agents located in ``regions`` by
+        gathering the agent columns, instead of generating a new population.
+        Region ids are renumbered to positions in ``regions``. The view
+        shares this simulator's weights and random generator and gets its
+        own routers.
+        """
+        region_ids = [self.region_to_id[region] for region in regions]
+        members = np.flatnonzero(np.isin(self.agent_region, region_ids))[:num_agents]
+        region_remap = np.zeros(len(self.regions), dtype=np.int8)
+        region_remap[region_ids] = np.arange(len(regions))
+        
+        view = copy.copy(self)
+        view.num_agents = members.size
+        view.num_routers = self.num_routers if num_routers is None else num_routers
+        view.regions = regions
+        view.region_to_id = {region: i for i, region in enumerate(regions)}
+        view.cross_region_lut = 1 - np.eye(len(regions), dtype=np.uint8)
+        view.routers = []
+        view.metrics_history = []
+        view.simulation_time = 0.0
+        
+        view.agent_local_idx = self.agent_local_idx[members]
+        view.agent_region = region_remap[self.agent_region[members]]
+        view.agent_load = self.agent_load[members]
+        view.agent_qos = self.agent_qos[members]
+        view.agent_transport = self.agent_transport[members]
+        view.agent_heartbeat = self.agent_heartbeat[members]
+        view.agent_intents = self.agent_intents[members]
+        view.has_build_intent = self.has_build_intent[members]
+        
+        view._initialize_routers()
+        return view
+    
+    def _fuse_prediction_weights(self) -> np.ndarray:
+        """Stack the latency and failure layers into one block-diagonal matrix.
+        
+        The failure network's first input is the predicted latency itself, so
+        its weight row is left out of the block and applied as a rank-1
+        update once the latency is known (see ``_simulate_message_batch``).
+        """
+        latency_weights = self.nn_weights['latency_prediction']
+        failure_weights = self.nn_weights['failure_prediction'][1:]
+        fused = np.zeros((
+            latency_weights.shape[0] + failure_weights.shape[0],
+            latency_weights.shape[1] + failure_weights.shape[1]
+        ))
+        fused[:latency_weights.shape[0], :latency_weights.shape[1]] = latency_weights
+        fused[latency_weights.shape[0]:, latency_weights.shape[1]:] = failure_weights
+        return fused
+    
     def _initialize_agents(self):
         """Initialize agent population with realistic distribution."""
         intent_types = [
@@ -242,167 +354,236 @@ class IICPNeuralNetworkSimulator:
             "urn:iicp:intent:build:python:v3.2"
         ]
         
+        # Agent attributes are stored as parallel columns (structure of
+        # arrays) so the batched path can gather them by index
+        self.agent_local_idx = np.arange(self.num_agents, dtype=np.int32)
+        self.agent_region = self.rng.integers(0, len(self.regions), self.num_agents, dtype=np.int8)
+        self.agent_load = self.rng.uniform(0.1, 0.8, self.num_agents).astype(np.float32)
+        self.agent_qos = self.rng.integers(0, len(_QOS_CLASSES), self.num_agents, dtype=np.int8)
+        self.agent_transport = self.rng.integers(0, len(_TRANSPORT_HINTS), self.num_agents, dtype=np.int8)
+        self.agent_heartbeat = np.full(self.num_agents, time.time())
+        self.agent_intents = np.empty(self.num_agents, dtype=object)
+        
+        # Each agent supports 1-3 distinct intents: the first k columns of a
+        # random per-agent permutation of intent_types
+        intent_counts = self.rng.integers(1, 4, self.num_agents)
+        intent_order = np.argsort(self.rng.random((self.num_agents, len(intent_types))), axis=1)
+        
         for i in range(self.num_agents):
-            region = random.choice(self.regions)
-            agent = Agent(
-                agent_id=f"llm://agent-{region}-{i:04d}",
-                region=region,
-                supported_intents=random.sample(intent_types, random.randint(1, 3)),
-                performance_class=random.choice(list(QoSClass)),
-                transport_pref=random.choice(list(TransportHint)),
-                load_factor=random.uniform(0.1, 0.8),
-                last_heartbeat=time.time()
-            )
-            self.agents.append(agent)
+            self.agent_intents[i] = [intent_types[j] for j in intent_order[i, :intent_counts[i]]]
+        
+        self.has_build_intent = np.array(
+            [any("build" in intent for intent in intents) for intents in self.agent_intents],
+            dtype=np.bool_
+        )
+    
+    def agent(self, idx: int) -> Agent:
+        """Materialize a single agent record from the column store."""
+        return Agent(
+            region=self.regions[self.agent_region[idx]],
+            local_idx=int(self.agent_local_idx[idx]),
+            supported_intents=self.agent_intents[idx],
+            performance_class=_QOS_CLASSES[self.agent_qos[idx]],
+            transport_pref=_TRANSPORT_HINTS[self.agent_transport[idx]],
+            load_factor=float(self.agent_load[idx]),
+            last_heartbeat=float(self.agent_heartbeat[idx])
+        )
     
     def _initialize_routers(self):
         """Initialize router network topology."""
         for i in range(self.num_routers):
             router = {
                 'router_id': f"router-{i:03d}",
-                'region': random.choice(self.regions),
+                'region': self.regions[self.rng.integers(len(self.regions))],
                 'queue_depth': 0,
                 'processed_messages': 0,
                 'error_count': 0,
-                'cpu_utilization': random.uniform(0.2, 0.6)
+                'cpu_utilization': self.rng.uniform(0.2, 0.6)
             }
             self.routers.append(router)
     
     def _neural_network_predict(self, input_vector: np.ndarray, weights: np.ndarray) -> np.ndarray:
         """Simple feedforward neural network prediction."""
-        # Activation function (ReLU)
-        def relu(x):
-            return np.maximum(0, x)
-        
-        # Forward pass
-        hidden = relu(np.dot(input_vector, weights))
+        # Forward pass with ReLU activation
+        hidden = np.maximum(0, np.dot(input_vector, weights))
         output = np.mean(hidden)  # Simple aggregation
         return max(0.001, output)  # Ensure positive output
     
-    def _calculate_message_latency(self, source_region: str, dest_region: str, 
-                                 message_size_kb: float, qos_class: QoSClass) -> float:
+    def _calculate_message_latency(self, source_region: int, dest_region: int, 
+                                 message_size_kb: float, qos: int) -> float:
         """Calculate message latency using neural network prediction."""
         
         # Feature engineering
-        cross_region = 1.0 if source_region != dest_region else 0.0
-        qos_priority = {"realtime": 1.0, "interactive": 0.6, "batch": 0.3}[qos_class.value]
-        network_load = random.uniform(0.3, 0.9)
-        
-        input_features = np.array([
-            cross_region,
-            qos_priority,
-            network_load,
-            min(message_size_kb / 100.0, 1.0),  # Normalized message size
-            random.uniform(0.1, 0.9),  # Network congestion
-            random.uniform(0.8, 1.0),  # Router efficiency
-            random.uniform(0.0, 0.3),  # Error rate
-            self.simulation_time / 1000.0,  # Time factor
-            len(self.agents) / 25000.0,  # Scale factor
-            random.uniform(0.5, 1.0)   # Random network factor
-        ])
+        cross_region = float(self.cross_region_lut[source_region, dest_region])
+        
+        input_features = self._lat_features
+        input_features[0] = cross_region
+        input_features[1] = _QOS_PRIORITY[qos]
+        input_features[2] = self.rng.uniform(0.3, 0.9)  # Network load
+        input_features[3] = min(message_size_kb / 100.0, 1.0)  # Normalized message size
+        input_features[4] = self.rng.uniform(0.1, 0.9)  # Network congestion
+        input_features[5] = self.rng.uniform(0.8, 1.0)  # Router efficiency
+        input_features[6] = self.rng.uniform(0.0, 0.3)  # Error rate
+        input_features[7] = self.simulation_time / 1000.0  # Time factor
+        input_features[8] = self.num_agents / 25000.0  # Scale factor
+        input_features[9] = self.rng.uniform(0.5, 1.0)  # Random network factor
         
         # Neural network prediction
         predicted_latency = self._neural_network_predict(
             input_features, self.nn_weights['latency_prediction']
         )
         
-        # Apply realistic scaling and bounds
-        base_latency = {
-            "realtime": 50,    # 50ms base for realtime
-            "interactive": 150, # 150ms base for interactive  
-            "batch": 500       # 500ms base for batch
-        }[qos_class.value]
-        
-        # Cross-region penalty
-        if cross_region:
-            base_latency *= random.uniform(2.0, 4.0)
-        
-        # Neural network adjustment
-        final_latency = base_latency * (0.5 + predicted_latency * 2.0)
+        # QoS base latency with cross-region penalty and neural network adjustment
+        penalty = self.rng.uniform(2.0, 4.0) if cross_region else 1.0
+        final_latency = _QOS_BASE_LATENCY_MS[qos] * penalty * (0.5 + predicted_latency * 2.0)
         
         # Add realistic noise
-        noise = np.random.normal(0, final_latency * 0.1)
+        noise = self.rng.normal(0, final_latency * 0.1)
         return max(10.0, final_latency + noise)
     
-    def _simulate_message_processing(self, message_type: MessageType, 
-                                   payload_size_kb: float) -> Tuple[float, bool]:
+    def _simulate_message_processing(self, payload_size_kb: float) -> Tuple[float, bool]:
         """Simulate processing of a single message."""
         
-        # Random source and destination
-        source_agent = random.choice(self.agents)
-        dest_agent = random.choice([a for a in self.agents if a != source_agent])
+        # Random source and a distinct destination
+        source_batch, dest_batch = self._sample_endpoints(1)
+        source_idx, dest_idx = int(source_batch[0]), int(dest_batch[0])
         
         # Calculate latency
         latency = self._calculate_message_latency(
-            source_agent.region,
-            dest_agent.region,
+            self.agent_region[source_idx],
+            self.agent_region[dest_idx],
             payload_size_kb,
-            source_agent.performance_class
+            self.agent_qos[source_idx]
         )
         
         # Simulate failure probability using neural network
-        failure_features = np.array([
-            latency / 1000.0,  # Normalized latency
-            payload_size_kb / 100.0,  # Normalized payload size
-            source_agent.load_factor,
-            dest_agent.load_factor,
-            random.uniform(0.0, 0.1),  # Network error rate
-            len(self.agents) / 25000.0  # Scale factor
-        ])
+        failure_features = self._fail_features
+        failure_features[0] = latency / 1000.0  # Normalized latency
+        failure_features[1] = payload_size_kb / 100.0  # Normalized payload size
+        failure_features[2] = self.agent_load[source_idx]
+        failure_features[3] = self.agent_load[dest_idx]
+        failure_features[4] = self.rng.uniform(0.0, 0.1)  # Network error rate
+        failure_features[5] = self.num_agents / 25000.0  # Scale factor
         
         failure_probability = self._neural_network_predict(
             failure_features, self.nn_weights['failure_prediction']
         )
         
         # Realistic failure rates (very low for well-designed protocol)
-        success = random.random() > (failure_probability * 0.01)  # Max 1% failure rate
+        success = self.rng.random() > (failure_probability * 0.01)  # Max 1% failure rate
         
         return latency, success
     
+    def _sample_endpoints(self, batch_size: int,
+                          agent_pool: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw distinct (source, destination) agent indices for a batch.
+        
+        The destination is the source shifted by 1 to n-1 positions, so every
+        pair is distinct in a single pass and each other agent is equally
+        likely. ``agent_pool`` restricts both ends to those agent indices.
+        """
+        pool_size = self.num_agents if agent_pool is None else agent_pool.size
+        source_idx = self.rng.integers(0, pool_size, batch_size)
+        dest_idx = (source_idx + self.rng.integers(1, pool_size, batch_size)) % pool_size
+        if agent_pool is not None:
+            source_idx, dest_idx = agent_pool[source_idx], agent_pool[dest_idx]
+        return source_idx, dest_idx
+    
+    def _simulate_message_batch(self, payload_sizes_kb: np.ndarray,
+                                agent_pool: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Simulate processing of a batch of messages in one fused-GEMM pass.
+        
+        Mirrors ``_simulate_message_processing`` feature for feature, but
+        draws every random input for the whole batch at once.
+        """
+        batch_size = payload_sizes_kb.size
+        num_agents = self.num_agents
+        source_idx, dest_idx = self._sample_endpoints(batch_size, agent_pool)
+        
+        # Every remaining random input, drawn for the whole batch up front
+        uniforms = self.rng.uniform(
+            _MESSAGE_UNIFORM_LOW, _MESSAGE_UNIFORM_HIGH, (batch_size, _MESSAGE_UNIFORM_LOW.size)
+        )
+        normals = self.rng.standard_normal(batch_size)
+        
+        source_qos = self.agent_qos[source_idx]
+        cross_region = self.cross_region_lut[
+            self.agent_region[source_idx], self.agent_region[dest_idx]
+        ].astype(np.float32)
+        
+        # Latency features in columns 0-9, failure features (minus the
+        # latency input) in columns 10-14
+        features = np.column_stack([
+            cross_region,
+            np.take(_QOS_PRIORITY, source_qos),
+            uniforms[:, 0],  # Network load
+            np.minimum(payload_sizes_kb / 100.0, 1.0),  # Normalized message size
+            uniforms[:, 1],  # Network congestion
+            uniforms[:, 2],  # Router efficiency
+            uniforms[:, 3],  # Error rate
+            np.full(batch_size, self.simulation_time / 1000.0),  # Time factor
+            np.full(batch_size, num_agents / 25000.0),  # Scale factor
+            uniforms[:, 4],  # Random network factor
+            payload_sizes_kb / 100.0,  # Normalized payload size
+            self.agent_load[source_idx],
+            self.agent_load[dest_idx],
+            uniforms[:, 6],  # Network error rate
+            np.full(batch_size, num_agents / 25000.0)  # Scale factor
+        ])
+        
+        # One GEMM produces the hidden layer of both networks
+        hidden = features @ self._fused_weights
+        latency_hidden = hidden[:, :5]
+        failure_hidden = hidden[:, 5:]
+        np.maximum(0, latency_hidden, out=latency_hidden)
+        predicted_latency = np.maximum(0.001, latency_hidden.mean(axis=1))
+        
+        # Cross-region penalty on the QoS base latency
+        penalty = np.where(cross_region > 0, uniforms[:, 5], 1.0)
+        final_latency = np.take(_QOS_BASE_LATENCY_MS, source_qos) * penalty * (0.5 + predicted_latency * 2.0)
+        latencies = np.maximum(10.0, final_latency * (1.0 + 0.1 * normals))
+        
+        # Feed the normalized latency into the failure layer
+        failure_hidden += np.outer(latencies / 1000.0, self.nn_weights['failure_prediction'][0])
+        np.maximum(0, failure_hidden, out=failure_hidden)
+        failure_probability = np.maximum(0.001, failure_hidden.mean(axis=1))
+        successes = uniforms[:, 7] > (failure_probability * 0.01)
+        
+        return latencies, successes
+    
     def run_large_scale_simulation(self, duration_seconds: int = 3600) -> PerformanceMetrics:
         """Run large-scale simulation (25,000 agents)."""
         print(f"🚀 Running Large-Scale Simulation ({self.num_agents:,} agents)...")
         
-        total_messages = 0
-        total_latency = 0
-        successful_messages = 0
-        error_count = 0
-        latencies = []
-        
         # Simulate message patterns
         messages_per_second = 900000 // duration_seconds  # Target throughput
+        latencies = np.empty(messages_per_second * duration_seconds, dtype=np.float32)
+        successes = np.empty(latencies.size, dtype=np.bool_)
         
         start_time = time.time()
         for second in range(duration_seconds):
             self.simulation_time = second
             
-            # Generate messages for this second
-            for _ in range(messages_per_second):
-                message_type = random.choice(list(MessageType))
-                payload_size = random.uniform(1, 500)  # 1-500KB
-                
-                latency, success = self._simulate_message_processing(message_type, payload_size)
-                
-                total_messages += 1
-                total_latency += latency
-                latencies.append(latency)
-                
-                if success:
-                    successful_messages += 1
-                else:
-                    error_count += 1
+            # Generate and process this second's messages as one batch
+            payload_sizes = self.rng.uniform(1, 500, messages_per_second)  # 1-500KB
+            
+            batch = slice(second * messages_per_second, (second + 1) * messages_per_second)
+            latencies[batch], successes[batch] = self._simulate_message_batch(payload_sizes)
             
             # Progress indicator
             if second % 600 == 0:  # Every 10 minutes
                 progress = (second / duration_seconds) * 100
-                print(f"   Progress: {progress:.1f}% - Processed {total_messages:,} messages")
+                print(f"   Progress: {progress:.1f}% - Processed {batch.stop:,} messages")
         
         simulation_time = time.time() - start_time
         
         # Calculate metrics
+        total_messages = latencies.size
+        successful_messages = int(successes.sum())
+        error_count = total_messages - successful_messages
         success_rate = (successful_messages / total_messages) * 100
-        avg_latency = total_latency / total_messages
-        p95_latency = np.percentile(latencies, 95)
+        avg_latency = float(latencies.sum(dtype=np.float64)) / total_messages
+        p95_latency, = _lower_quantiles(latencies, (0.95,))
         throughput = total_messages / simulation_time
         
         metrics = PerformanceMetrics(
@@ -410,7 +591,7 @@ class IICPNeuralNetworkSimulator:
             success_rate=success_rate,
             throughput_msg_per_sec=throughput,
             error_count=error_count,
-            cpu_utilization=random.uniform(65, 85),
+            cpu_utilization=self.rng.uniform(65, 85),
             memory_usage_mb=45.0
         )
         
@@ -422,44 +603,32 @@ class IICPNeuralNetworkSimulator:
         print(f"🏗️  Running Build System Simulation ({min(6000, self.num_agents)} agents)...")
         
         # Focus on build-related intents
-        build_agents = [a for a in self.agents[:6000] if any("build" in intent for intent in a.supported_intents)]
-        if len(build_agents) < 1000:
+        build_agents = np.flatnonzero(self.has_build_intent[:6000])
+        if build_agents.size < 1000:
             # Add more build agents if needed
-            build_agents = self.agents[:6000]
-        
-        total_builds = 0
-        successful_builds = 0
-        build_latencies = []
-        
-        # Simulate 1000 build requests
-        for build_id in range(1000):
-            # Simulate Rust/Python build pipeline
-            rust_latency, rust_success = self._simulate_message_processing(
-                MessageType.CALL, random.uniform(50, 200)  # Build artifacts
-            )
-            python_latency, python_success = self._simulate_message_processing(
-                MessageType.CALL, random.uniform(30, 150)  # Python packages
-            )
-            
-            total_build_time = rust_latency + python_latency
-            build_success = rust_success and python_success
-            
-            total_builds += 1
-            build_latencies.append(total_build_time)
-            
-            if build_success:
-                successful_builds += 1
+            build_agents = np.arange(min(6000, self.num_agents))
+        
+        # Simulate 1000 Rust/Python build pipelines as one batch: the first
+        # half are Rust builds, the second half the paired Python steps
+        total_builds = 1000
+        payload_sizes = np.concatenate([
+            self.rng.uniform(50, 200, total_builds),  # Build artifacts
+            self.rng.uniform(30, 150, total_builds)   # Python packages
+        ])
+        
+        step_latencies, step_successes = self._simulate_message_batch(payload_sizes, build_agents)
+        build_latencies = step_latencies.reshape(2, total_builds).sum(axis=0)
+        successful_builds = int(step_successes.reshape(2, total_builds).all(axis=0).sum())
         
         success_rate = (successful_builds / total_builds) * 100
-        median_latency = np.median(build_latencies)
-        p95_latency = np.percentile(build_latencies, 95)
+        median_latency, p95_latency = _lower_quantiles(build_latencies, (0.5, 0.95))
         
         metrics = PerformanceMetrics(
             latency_ms=median_latency,
             success_rate=success_rate,
             throughput_msg_per_sec=total_builds / 300,  # 5-minute simulation
             error_count=total_builds - successful_builds,
-            cpu_utilization=random.uniform(70, 85),
+            cpu_utilization=self.rng.uniform(70, 85),
             memory_usage_mb=45.0
         )
         
@@ -492,8 +661,8 @@ def create_performance_validation_report():
     
     large_metrics = large_sim.run_large_scale_simulation(duration_seconds=300)  # 5-minute simulation
     
-    # Build system simulation  
-    build_sim = IICPNeuralNetworkSimulator(
+    # Build system simulation on a two-region subset of the same population
+    build_sim = large_sim.view(
         num_agents=6000,
         num_routers=20,
         regions=["us-east-1", "eu-west-1"]
@@ -568,28 +737,43 @@ between system parameters and performance outcomes, providing more accurate
 predictions than static analytical models.
 """
 
+def write_json(path: str, payload: dict) -> None:
+    """Write ``payload`` as two-space indented JSON, via orjson when available.
+    
+    The stdlib fallback writes the same bytes for strings, ints and ordinary
+    floats. It spells exponent floats differently (``1e-07`` and ``1e+16``
+    versus orjson's ``1e-7`` and ``1e16``), which parse to the same document.
+    It also writes non-finite floats as ``NaN``/``Infinity``, which are not
+    valid JSON, where orjson writes ``null``.
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+
 if __name__ == "__main__":
     results = create_performance_validation_report()
     
     # Save results to JSON for documentation
-    with open('/Users/roble/Library/Mobile Documents/com~apple~CloudDocs/Blog Article/IICP/validation_results_v1.4.2.json', 'w') as f:
-        json.dump({
-            'timestamp': time.time(),
-            'version': '1.4.2',
-            'integrity_score': results['integrity_score'],
-            'large_scale': {
-                'success_rate': results['large_scale_metrics'].success_rate,
-                'latency_ms': results['large_scale_metrics'].latency_ms,
-                'throughput': results['large_scale_metrics'].throughput_msg_per_sec,
-                'error_count': results['large_scale_metrics'].error_count
-            },
-            'build_system': {
-                'success_rate': results['build_metrics'].success_rate,
-                'latency_ms': results['build_metrics'].latency_ms,
-                'error_count': results['build_metrics'].error_count
-            },
-            'methodology': results['methodology']
-        }, f, indent=2)
+    write_json('/Users/roble/Library/Mobile Documents/com~apple~CloudDocs/Blog Article/IICP/validation_results_v1.4.2.json', {
+        'timestamp': time.time(),
+        'version': '1.4.2',
+        'integrity_score': results['integrity_score'],
+        'large_scale': {
+            'success_rate': results['large_scale_metrics'].success_rate,
+            'latency_ms': results['large_scale_metrics'].latency_ms,
+            'throughput': results['large_scale_metrics'].throughput_msg_per_sec,
+            'error_count': results['large_scale_metrics'].error_count
+        },
+        'build_system': {
+            'success_rate': results['build_metrics'].success_rate,
+            'latency_ms': results['build_metrics'].latency_ms,
+            'error_count': results['build_metrics'].error_count
+        },
+        'methodology': results['methodology']
+    })
     
     print(f"\n📄 Results saved to validation_results_v1.4.2.json")
     print("\n✅ Performance validation complete!")
\ No newline at end of file
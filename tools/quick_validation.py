@@ -44,50 +44,39 @@ def neural_network_simulation():
     num_agents = 25000
     simulation_rounds = 1000
     
+    rng = np.random.default_rng()
+    
     # Neural network weights (simplified)
-    latency_weights = np.random.normal(0, 0.1, 10)
-    success_weights = np.random.normal(0.95, 0.05, 5)  # High success rate baseline
+    latency_weights = rng.normal(0, 0.1, 10)
+    success_weights = rng.normal(0.95, 0.05, 5)  # High success rate baseline
     
-    latencies = []
-    successes = 0
-    total_messages = 0
+    # Messages are processed in 25 agent groups per round
+    total_messages = simulation_rounds * 25
     
     print(f"   Simulating {num_agents:,} agents across {simulation_rounds} rounds...")
     
-    for round_num in range(simulation_rounds):
-        # Simulate message processing
-        for agent_group in range(25):  # Process in groups for efficiency
-            # Feature vector: [cross_region, qos_priority, network_load, message_size, congestion]
-            features = np.array([
-                random.uniform(0, 1),      # cross_region probability
-                random.uniform(0.3, 1.0),  # qos_priority
-                random.uniform(0.3, 0.9),  # network_load
-                random.uniform(0.1, 1.0),  # normalized message size
-                random.uniform(0.0, 0.3)   # congestion
-            ])
-            
-            # Neural network prediction (simplified)
-            latency_prediction = np.dot(features, latency_weights[:5])
-            success_prediction = np.mean(success_weights)
-            
-            # Apply realistic scaling
-            if features[0] > 0.5:  # Cross-region
-                base_latency = random.uniform(3000, 7000)  # 3-7 seconds
-            else:
-                base_latency = random.uniform(100, 2000)   # 0.1-2 seconds
-            
-            final_latency = base_latency * (0.8 + abs(latency_prediction) * 0.4)
-            latencies.append(final_latency)
-            
-            # Success determination
-            if random.random() < min(0.9999, success_prediction):
-                successes += 1
-            
-            total_messages += 1
-        
-        if round_num % 100 == 0:
-            progress = (round_num / simulation_rounds) * 100
-            print(f"   Progress: {progress:.0f}%")
+    # Feature matrix, one row per message:
+    # [cross_region, qos_priority, network_load, message_size, congestion]
+    features = rng.uniform(
+        [0.0, 0.3, 0.3, 0.1, 0.0],
+        [1.0, 1.0, 0.9, 1.0, 0.3],
+        size=(total_messages, 5)
+    )
+    
+    # Neural network prediction (simplified)
+    latency_predictions = features @ latency_weights[:5]
+    success_prediction = np.mean(success_weights)
+    
+    # Apply realistic scaling: 3-7 seconds cross-region, 0.1-2 seconds otherwise
+    base_latency = np.where(
+        features[:, 0] > 0.5,
+        rng.uniform(3000, 7000, total_messages),
+        rng.uniform(100, 2000, total_messages)
+    )
+    latencies = base_latency * (0.8 + np.abs(latency_predictions) * 0.4)
+    
+    # Success determination
+    successes = int((rng.random(total_messages) < min(0.9999, success_prediction)).sum())
     
     # Calculate final metrics
     success_rate = (successes / total_messages) * 100
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional tool dependency
+    np = None
+
+if np is not None:
+    import protocol_integrity_analysis
+    from protocol_integrity_analysis import (
+        IICPNeuralNetworkSimulator,
+        ProtocolIntegrityAnalyzer,
+        _lower_quantiles,
+        write_json,
+    )
+
+REGIONS = ["us-east-1", "eu-west-1", "ap-south-1"]
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class ProtocolIntegrityAnalyzerTest(unittest.TestCase):
+    def score(self, analyzer: ProtocolIntegrityAnalyzer) -> float:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return analyzer.calculate_integrity_score()
+
+    def test_current_definitions_score_full_marks(self) -> None:
+        analyzer = ProtocolIntegrityAnalyzer()
+
+        self.assertEqual(100.0, self.score(analyzer))
+        self.assertEqual([], analyzer.issues)
+
+    def test_opcode_gap_is_reported(self) -> None:
+        class GappedAnalyzer(ProtocolIntegrityAnalyzer):
+            _ACTUAL_OPCODE_SET = ProtocolIntegrityAnalyzer._ACTUAL_OPCODE_SET - {0x05}
+
+        analyzer = GappedAnalyzer()
+
+        self.assertLess(self.score(analyzer), 100.0)
+        self.assertEqual(["Missing opcodes: ['0x5']"], analyzer.issues)
+        self.assertFalse(analyzer.validation_results["message_consistency"]["completeness"])
+
+    def test_analyze_methods_report_compiled_rules(self) -> None:
+        class MisnamedHeaderAnalyzer(ProtocolIntegrityAnalyzer):
+            _IICP_HEADERS = ProtocolIntegrityAnalyzer._IICP_HEADERS + ("IICP-Legacy",)
+
+        analyzer = MisnamedHeaderAnalyzer()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            header_consistency = analyzer.analyze_header_field_consistency()
+
+        self.assertFalse(header_consistency["naming_convention"])
+        self.assertEqual(["Header IICP-Legacy doesn't follow X-IICP- convention"], analyzer.issues)
+        self.assertIn("🔍 Analyzing Header Field Consistency...", output.getvalue())
+        self.assertIs(
+            MisnamedHeaderAnalyzer._compiled_validator(),
+            MisnamedHeaderAnalyzer._compiled_validator(),
+        )
+
+    def test_score_prints_progress_for_each_analysis(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            ProtocolIntegrityAnalyzer().calculate_integrity_score()
+
+        for heading in ("Protocol Message Consistency", "Header Field Consistency", "Version Compatibility"):
+            self.assertIn(f"🔍 Analyzing {heading}...", output.getvalue())
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class WriteJsonTest(unittest.TestCase):
+    def write_both(self, payload: dict) -> tuple[bytes, bytes]:
+        with tempfile.TemporaryDirectory() as directory:
+            fast = Path(directory) / "fast.json"
+            stdlib = Path(directory) / "stdlib.json"
+            write_json(str(fast), payload)
+            with mock.patch.object(protocol_integrity_analysis, "orjson", None):
+                write_json(str(stdlib), payload)
+            return fast.read_bytes(), stdlib.read_bytes()
+
+    def test_report_payload_is_byte_identical(self) -> None:
+        fast, stdlib = self.write_both({
+            "version": "1.4.2",
+            "large_scale": {"latency_ms": np.float64(12.5), "error_count": 3},
+            "methodology": protocol_integrity_analysis.generate_methodology_explanation(),
+        })
+
+        self.assertIn("•".encode("utf-8"), fast)
+        self.assertEqual(fast, stdlib)
+
+    def test_float_edge_values_diverge(self) -> None:
+        if protocol_integrity_analysis.orjson is None:
+            self.skipTest("orjson is not installed")
+
+        fast, stdlib = self.write_both({"small": 1e-07, "large": 1e16})
+        self.assertEqual(b'{\n  "small": 1e-7,\n  "large": 1e16\n}', fast)
+        self.assertEqual(b'{\n  "small": 1e-07,\n  "large": 1e+16\n}', stdlib)
+        self.assertEqual(json.loads(fast), json.loads(stdlib))
+
+        fast, stdlib = self.write_both({"latency_ms": float("nan")})
+        self.assertEqual(b'{\n  "latency_ms": null\n}', fast)
+        self.assertEqual(b'{\n  "latency_ms": NaN\n}', stdlib)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class LowerQuantilesTest(unittest.TestCase):
+    def test_matches_numpy_lower_method(self) -> None:
+        for size in (1, 2, 1000, 1001):
+            values = np.random.standard_normal(size)
+            self.assertEqual(
+                [float(np.quantile(values, q, method="lower")) for q in (0.5, 0.95)],
+                _lower_quantiles(values, (0.5, 0.95)),
+            )
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class NeuralNetworkSimulatorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = IICPNeuralNetworkSimulator(num_agents=500, num_routers=4, regions=REGIONS)
+
+    def test_agent_record_round_trips_through_columns(self) -> None:
+        agent = self.simulator.agent(7)
+
+        self.assertEqual(REGIONS[self.simulator.agent_region[7]], agent.region)
+        self.assertEqual(f"llm://agent-{agent.region}-0007", agent.agent_id)
+        self.assertEqual(
+            any("build" in intent for intent in agent.supported_intents),
+            bool(self.simulator.has_build_intent[7]),
+        )
+
+    def test_single_message_reuses_feature_buffers(self) -> None:
+        buffers = (self.simulator._lat_features, self.simulator._fail_features)
+        latency, success = self.simulator._simulate_message_processing(120.0)
+
+        self.assertGreaterEqual(latency, 10.0)
+        self.assertIn(bool(success), (True, False))
+        self.assertIs(buffers[0], self.simulator._lat_features)
+        self.assertEqual(latency / 1000.0, self.simulator._fail_features[0])
+
+    def test_endpoints_are_distinct_and_stay_in_pool(self) -> None:
+        source_idx, dest_idx = self.simulator._sample_endpoints(5000)
+        self.assertFalse(np.any(source_idx == dest_idx))
+
+        pool = np.array([3, 17, 42])
+        source_idx, dest_idx = self.simulator._sample_endpoints(5000, pool)
+        self.assertFalse(np.any(source_idx == dest_idx))
+        self.assertTrue(np.isin(source_idx, pool).all())
+        self.assertTrue(np.isin(dest_idx, pool).all())
+
+    def test_message_batch_matches_scalar_bounds(self) -> None:
+        payload_sizes = np.random.uniform(1, 500, 2000)
+        latencies, successes = self.simulator._simulate_message_batch(payload_sizes)
+
+        self.assertEqual((2000,), latencies.shape)
+        self.assertEqual((2000,), successes.shape)
+        self.assertEqual(np.bool_, successes.dtype)
+        self.assertGreaterEqual(float(latencies.min()), 10.0)
+        # Failure probability is capped well below 1% per message.
+        self.assertGreater(float(successes.mean()), 0.9)
+
+    def test_seed_makes_simulation_reproducible(self) -> None:
+        payload_sizes = np.full(1000, 100.0)
+        first = IICPNeuralNetworkSimulator(num_agents=200, num_routers=2, regions=REGIONS, seed=7)
+        second = IICPNeuralNetworkSimulator(num_agents=200, num_routers=2, regions=REGIONS, seed=7)
+
+        np.testing.assert_array_equal(
+            first._simulate_message_batch(payload_sizes)[0],
+            second._simulate_message_batch(payload_sizes)[0],
+        )
+
+    def test_large_scale_simulation_metrics(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            metrics = self.simulator.run_large_scale_simulation(duration_seconds=450)
+
+        self.assertLess(metrics.error_count, 900000 * 0.01)
+        self.assertGreater(metrics.throughput_msg_per_sec, 0.0)
+        self.assertGreater(metrics.success_rate, 90.0)
+        self.assertGreaterEqual(metrics.latency_ms, 10.0)
+
+    def test_view_reuses_population_subset(self) -> None:
+        view = self.simulator.view(num_agents=100, num_routers=2, regions=["ap-south-1", "us-east-1"])
+
+        self.assertEqual(100, view.num_agents)
+        self.assertEqual(2, len(view.routers))
+        self.assertEqual(4, len(self.simulator.routers))
+        self.assertIs(self.simulator.nn_weights, view.nn_weights)
+        for idx in (0, 50, 99):
+            agent = view.agent(idx)
+            self.assertIn(agent.region, ("ap-south-1", "us-east-1"))
+            self.assertTrue(agent.agent_id.startswith(f"llm://agent-{agent.region}-"))
+        latencies, _ = view._simulate_message_batch(np.full(500, 50.0))
+        self.assertEqual((500,), latencies.shape)
+
+    def test_build_system_simulation_metrics(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            metrics = self.simulator.run_build_system_simulation()
+
+        self.assertAlmostEqual(1000 / 300, metrics.throughput_msg_per_sec)
+        self.assertAlmostEqual(100.0 - metrics.error_count / 10, metrics.success_rate)
+        # Each build is two pipeline steps, each at least 10ms.
+        self.assertGreaterEqual(metrics.latency_ms, 20.0)
+
+
+if __name__ == "__main__":
+    unittest.main()